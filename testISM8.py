@@ -4,13 +4,23 @@ import datetime
 import wolf_ism8 as wolf
 
 
+class FakeTransport:
+    """collects everything sent, instead of writing to an ISM8"""
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+    def writelines(self, list_of_data):
+        self.written.append(b"".join(list_of_data))
+
+
 async def setup_server(tst_ism8: wolf.Ism8):
     _eventloop = asyncio.get_running_loop()
-    task1 = _eventloop.create_task(
-        _eventloop.create_server(tst_ism8.factory, port=12004)
-    )
     print("Setup Server")
-    _server = await task1
+    _server = await _eventloop.create_server(tst_ism8.factory, port=12004)
     _LOGGER.debug(f"Waiting for ISM8 connection on {_server.sockets[0].getsockname()}")
     return _server
 
@@ -78,6 +88,11 @@ async def test_date_implementation(tst_ism8: wolf.Ism8):
     test_bytes = bytearray(b"\x15\x05\x18")
     tst_ism8.decode_datapoint(155, test_bytes)
 
+    print("trying to decode date 2000-00-00 and a short date. should fail")
+    tst_ism8.decode_datapoint(155, bytearray(b"\x00\x00\x00"))
+    tst_ism8.decode_datapoint(155, bytearray(b"\x15\x05"))
+    assert tst_ism8._dp_values[155] == datetime.date(2024, 5, 21)
+
     print("encode/decode roundtrip")
     test_bytes = tst_ism8.encode_datapoint(datetime.date(2024, 5, 30), 154)
     if test_bytes:
@@ -85,6 +100,10 @@ async def test_date_implementation(tst_ism8: wolf.Ism8):
     print(tst_ism8._dp_values[155])
     assert tst_ism8._dp_values[155] == datetime.date(2024, 5, 30)
 
+    print("decode date straight from the wire bytes")
+    assert wolf.decode_date_bytes(b"\x00\x15\x05\x18", 1) == datetime.date(2024, 5, 21)
+    assert wolf.decode_date_bytes(b"\x15\x05\x18") == wolf.decode_date(0x150518)
+
 
 async def test_time_of_day_implementation(tst_ism8: wolf.Ism8):
     """ """
@@ -119,6 +138,100 @@ async def test_time_of_day_implementation(tst_ism8: wolf.Ism8):
     print(tst_ism8._dp_values[156])
     assert tst_ism8._dp_values[156] == datetime.time(hour=15, minute=38)
 
+    print("decode time straight from the wire bytes")
+    assert wolf.decode_time_of_day_bytes(b"\x16\x06\x07") == datetime.time(22, 6, 7)
+    assert wolf.decode_time_of_day_bytes(b"\x30\x0C\x60") == wolf.decode_time_of_day(
+        0x300C60
+    )
+
+
+async def test_decode_only_registered():
+    """
+    155: ("CWL_Wohnraumlueftung", "Intensivlueftung Enddatum", "DPT_Date", True),
+    """
+    lazy_ism8 = wolf.Ism8(decode_only_registered=True)
+
+    print("decoding of dp without callback is deferred until it is read")
+    lazy_ism8.decode_datapoint(155, b"\x15\x05\x18")
+    assert 155 not in lazy_ism8._dp_values
+    assert lazy_ism8.read_sensor(155) == datetime.date(2024, 5, 21)
+
+    print("dp with callback is decoded right away")
+    callback_values = []
+    lazy_ism8.register_callback(
+        lambda: callback_values.append(lazy_ism8._dp_values[156]), 156
+    )
+    lazy_ism8.decode_datapoint(156, b"\x0d\x38\x00")
+    assert callback_values == [datetime.time(hour=13, minute=56)]
+
+    print("sending a value replaces a pending reading")
+    lazy_ism8._transport = FakeTransport()
+    lazy_ism8._connected = True
+    lazy_ism8.decode_datapoint(154, b"\x15\x05\x18")
+    lazy_ism8.send_dp_value(154, datetime.date(2024, 5, 30))
+    assert lazy_ism8.read_sensor(154) == datetime.date(2024, 5, 30)
+
+    print("reading several sensors, one pending reading is broken")
+    lazy_ism8.decode_datapoint(159, b"\x04\x06\x07")
+    lazy_ism8.decode_datapoint(155, b"\x00\x00\x00")
+    assert lazy_ism8.read_sensors([159, 155, 4]) == [
+        datetime.date(2007, 6, 4),
+        datetime.date(2024, 5, 21),
+        None,
+    ]
+
+
+async def test_malformed_frames():
+    """
+    1: ("Heizgeraet1", "Stoerung", "DPT_Switch", False),
+    """
+    frame_ism8 = wolf.Ism8()
+    frame_ism8._transport = FakeTransport()
+    frame_ism8._connected = True
+    # service, start dp, number of dps, then dp_id, command, length and value
+    datagram = wolf.ISM_SERVICE_RECEIVE + b"\x00\x01\x00\x01\x00\x01\x03\x01\x01"
+
+    print("frame with zero length is discarded without ACK")
+    frame_ism8.data_received(
+        wolf.ISM_HEADER + b"\x00\x00" + wolf.ISM_CONN_HEADER + datagram
+    )
+    assert frame_ism8._transport.written == []
+
+    print("datagram announcing more dps than it holds is discarded without ACK")
+    broken = datagram[:4] + b"\x00\x02" + datagram[6:]
+    frame_ism8.data_received(
+        wolf.ISM_HEADER + b"\x00\x15" + wolf.ISM_CONN_HEADER + broken
+    )
+    assert frame_ism8._transport.written == []
+    assert 1 not in frame_ism8._dp_values
+
+    print("valid frame is acknowledged and decoded")
+    frame_ism8.data_received(
+        wolf.ISM_HEADER + b"\x00\x15" + wolf.ISM_CONN_HEADER + datagram
+    )
+    assert len(frame_ism8._transport.written) == 1
+    assert frame_ism8._dp_values[1] is True
+
+
+async def test_float_implementation(tst_ism8: wolf.Ism8):
+    """
+    4: ("Heizgeraet1", "Kesseltemperatur", "DPT_Value_Temp", False),
+    """
+    print("encode/decode roundtrip of floats at exponent boundaries")
+    for value, expected in (
+        (0.0, 0.0),
+        (20.0, 20.0),
+        (-12.3, -12.3),
+        (20.47, 20.48),
+        (163.79, 163.84),
+        (-163.79, -163.76),
+        (-670760.0, -670760.96),
+    ):
+        test_bytes = tst_ism8.encode_datapoint(value, 56)
+        tst_ism8.decode_datapoint(4, test_bytes)
+        print(f"{value} -> {test_bytes.hex(':')} -> {tst_ism8._dp_values[4]}")
+        assert round(tst_ism8._dp_values[4], 2) == expected
+
 
 async def test_write_scaling(tst_ism8: wolf.Ism8):
     """
@@ -200,6 +313,9 @@ async def main():
     await test_write_HVACMode149(ism8)
     await test_date_implementation(ism8)
     await test_time_of_day_implementation(ism8)
+    await test_float_implementation(ism8)
+    await test_decode_only_registered()
+    await test_malformed_frames()
     await test_HVACCONTRMode(ism8)
     print(ism8.get_value_range(57))
     print(ism8.get_value_range(157))
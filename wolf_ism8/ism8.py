@@ -4,9 +4,115 @@ Module for gathering info and sending commands from/to Wolf HVAC System via ISM8
 
 import logging
 import asyncio
+import struct
 from .ism8_constants import *
 from .ism8_helper_functions import *
 
+# precompiled layouts of 16 bit length/counter fields and datapoint headers
+# (dp_id, command, value length) in received messages
+_UINT16 = struct.Struct(">H")
+_DP_HEADER = struct.Struct(">HBB")
+
+# ACK messages only differ in bytes 12 and 13, which are copied from the
+# received message. the constant parts around them are sent as they are
+_ACK_HEAD = ISM_ACK_DP_MSG[:12]
+_ACK_TAIL = ISM_ACK_DP_MSG[14:]
+
+# decoding function per datatype, types not listed here are decoded as INT
+_DECODERS = {
+    "DPT_Switch": decode_Bool,
+    "DPT_Bool": decode_Bool,
+    "DPT_Enable": decode_Bool,
+    "DPT_OpenClose": decode_Bool,
+    "DPT_Value_Temp": decode_Float,
+    "DPT_Value_Tempd": decode_Float,
+    "DPT_Tempd": decode_Float,
+    "DPT_Value_Pres": decode_Float,
+    "DPT_Power": decode_Float,
+    "DPT_Value_Volume_Flow": decode_Float,
+    "DPT_ActiveEnergy": decode_Int,
+    "DPT_ActiveEnergy_kWh": decode_Int,
+    "DPT_FlowRate_m3/h": lambda x: 0.0001 * decode_Int(x),
+    "DPT_Scaling": decode_Scaling,
+    "DPT_HVACMode": lambda x: decode_table(x, HVACModes_TABLE),
+    "DPT_HVACMode_CWL": lambda x: decode_table(x, HVACModes_CWL_TABLE),
+    "DPT_DHWMode": lambda x: decode_table(x, DHWModes_TABLE),
+    "DPT_HVACContrMode": lambda x: decode_table(x, HVACContrModes_TABLE),
+    "DPT_Date": decode_date,
+    "DPT_TimeOfDay": decode_time_of_day,
+}
+
+# datatypes decoded straight from the received bytes instead of their integer
+# value. like the integer decoders, they only look at the last 3 bytes
+_BYTES_DECODERS = {
+    "DPT_Date": lambda x: decode_date_bytes(x, len(x) - 3),
+    "DPT_TimeOfDay": lambda x: decode_time_of_day_bytes(x, len(x) - 3),
+}
+
+# datatypes whose invalid (None) readings are discarded instead of stored,
+# mapped to an upper limit above which readings are discarded as well
+_DISCARD_ABOVE = {
+    "DPT_Value_Temp": None,
+    "DPT_Value_Tempd": None,
+    "DPT_Tempd": None,
+    "DPT_Value_Pres": None,
+    "DPT_Power": 1000,
+    "DPT_Value_Volume_Flow": None,
+    "DPT_FlowRate_m3/h": 1000,
+}
+
+# encoding function per datatype, types not listed here can't be written
+_ENCODERS = {
+    "DPT_Switch": encode_Bool,
+    "DPT_Bool": encode_Bool,
+    "DPT_Enable": encode_Bool,
+    "DPT_OpenClose": encode_Bool,
+    "DPT_Value_Temp": encode_Float,
+    "DPT_Value_Tempd": encode_Float,
+    "DPT_Tempd": encode_Float,
+    "DPT_Value_Pres": encode_Float,
+    "DPT_Power": encode_Float,
+    "DPT_Value_Volume_Flow": encode_Float,
+    "DPT_Scaling": encode_Scaling,
+    "DPT_HVACMode": lambda x: encode_reverse(x, HVACModes_REV),
+    "DPT_HVACMode_CWL": lambda x: encode_reverse(x, HVACModes_CWL_REV),
+    "DPT_HVACContrMode": lambda x: encode_reverse(x, HVACContrModes_REV),
+    "DPT_DHWMode": lambda x: encode_reverse(x, DHWModes_REV),
+    "DPT_Date": encode_date,
+    "DPT_TimeOfDay": encode_time_of_day,
+}
+
+# per-column lookup tables, derived from DATAPOINTS in one pass at import
+_DP_DEVICE = {}
+_DP_NAME = {}
+_DP_TYPE = {}
+_DP_RW = {}
+_DP_UNIT = {}
+# datatype, decoder and encoder per datapoint, resolved from the tables above
+_DP_CODEC = {}
+# decoder taking the received bytes, for datapoints of those datatypes only
+_DP_BYTES_DECODER = {}
+for _dp_id, _dp in DATAPOINTS.items():
+    _DP_DEVICE[_dp_id] = _dp[IX_DEVICENAME]
+    _DP_NAME[_dp_id] = _dp[IX_NAME]
+    _DP_TYPE[_dp_id] = _dp[IX_TYPE]
+    _DP_RW[_dp_id] = _dp[IX_RW_FLAG]
+    if _dp[IX_TYPE] in DATATYPES:
+        _DP_UNIT[_dp_id] = DATATYPES[_dp[IX_TYPE]][DT_UNIT]
+    _DP_CODEC[_dp_id] = (
+        _dp[IX_TYPE],
+        _DECODERS.get(_dp[IX_TYPE]),
+        _ENCODERS.get(_dp[IX_TYPE]),
+    )
+    if _dp[IX_TYPE] in _BYTES_DECODERS:
+        _DP_BYTES_DECODER[_dp_id] = _BYTES_DECODERS[_dp[IX_TYPE]]
+del _dp_id, _dp
+_ALL_DEVICES = tuple(sorted(set(_DP_DEVICE.values())))
+
+
+class Ism8ProtocolError(Exception):
+    """raised when a received message does not match the ISM8 API"""
+
 
 class Ism8(asyncio.Protocol):
     """
@@ -20,17 +126,17 @@ class Ism8(asyncio.Protocol):
     @staticmethod
     def get_device(dp_id: int) -> str:
         """returns device ID from private array of sensor-readings"""
-        return DATAPOINTS.get(dp_id, ["", "", "", "", ""])[IX_DEVICENAME]
+        return _DP_DEVICE.get(dp_id, "")
 
     @staticmethod
     def get_name(dp_id: int) -> str:
         """returns sensor name from static Dictionary"""
-        return DATAPOINTS.get(dp_id, ["", "", "", "", ""])[IX_NAME]
+        return _DP_NAME.get(dp_id, "")
 
     @staticmethod
     def get_type(dp_id: int) -> str:
         """returns sensor type from static Dictionary"""
-        return DATAPOINTS.get(dp_id, ["", "", "", "", ""])[IX_TYPE]
+        return _DP_TYPE.get(dp_id, "")
 
     @staticmethod
     def get_version() -> str:
@@ -40,19 +146,12 @@ class Ism8(asyncio.Protocol):
     @staticmethod
     def get_unit(dp_id: int) -> str:
         """returns datapoint unit from static Dictionary"""
-        if dp_id in DATAPOINTS:
-            dp_type = DATAPOINTS[dp_id][IX_TYPE]
-            return DATATYPES[dp_type][DT_UNIT]
-        else:
-            return ""
+        return _DP_UNIT.get(dp_id, "")
 
     @staticmethod
     def is_writable(dp_id) -> bool:
         """returns writable flag from static Dictionary"""
-        if dp_id in DATAPOINTS.keys():
-            return DATAPOINTS[dp_id][IX_RW_FLAG]
-        else:
-            return False
+        return _DP_RW.get(dp_id, False)
 
     @staticmethod
     def get_value_range(dp_id: int):
@@ -72,7 +171,7 @@ class Ism8(asyncio.Protocol):
     @staticmethod
     def get_all_devices():
         """returns list of all ISM8 devices. Unique first Component of DATAPOINTS"""
-        return sorted(set([x[0] for x in DATAPOINTS.values()]))
+        return list(_ALL_DEVICES)
 
     @staticmethod
     def first_fw_version(dp_id: int) -> str:
@@ -89,14 +188,20 @@ class Ism8(asyncio.Protocol):
             return "1.80"
         return "1.00"
 
-    def __init__(self):
+    def __init__(self, decode_only_registered: bool = False):
         # the datapoint-values from the device are stored and buffered here
         self._dp_values = {}
+        # if set, datapoints without callback are only decoded when read.
+        # until then their raw integer values are buffered here
+        self._decode_only_registered = decode_only_registered
+        self._dp_raw_pending = {}
         self._transport = None
         self._remote_ip_address = None
         self._connected = False
         # the callbacks for all datapoints are stored in a dictionary
         self._callback_on_data = {}
+        # constant head of outgoing messages, built once per datapoint
+        self._tx_prefix_cache = {}
         return
 
     def factory(self):
@@ -108,7 +213,8 @@ class Ism8(asyncio.Protocol):
     def request_all_datapoints(self) -> None:
         """send 'request all datapoints' to ISM8"""
         req_msg = bytearray(ISM_REQ_DP_MSG)
-        Ism8.log.debug("Sending REQ_ALL_DP: %s ", req_msg.hex(":"))
+        if Ism8.log.isEnabledFor(logging.DEBUG):
+            Ism8.log.debug("Sending REQ_ALL_DP: %s ", req_msg.hex(":"))
         if self._transport:
             self._transport.write(req_msg)  # type: ignore
 
@@ -140,18 +246,32 @@ class Ism8(asyncio.Protocol):
     def data_received(self, data) -> None:
         """is called whenever data is ready. Conducts buffering, slices the messages
         and extracts the payload for further processing."""
+        # bind frequently used globals/attributes to locals for the loop below
+        _header = ISM_HEADER
+        _ack_head = _ACK_HEAD
+        _ack_tail = _ACK_TAIL
+        _writelines = self._transport.writelines if self._transport else None
+        _split_msg = self._split_msg
+        _decode_dps = self._decode_dps
+        _unpack_uint16 = _UINT16.unpack_from
+        data_len = len(data)
+        # messages are handed on as zero-copy slices of the receive buffer
+        data_view = memoryview(data)
         _header_ptr = 0
         msg_length = 0
-        while _header_ptr < len(data):
-            _header_ptr = data.find(ISM_HEADER, _header_ptr)
+        while _header_ptr < data_len:
+            # frames usually follow each other back to back, so only search
+            # for the next header if it is not right at the current position
+            if not data.startswith(_header, _header_ptr):
+                _header_ptr = data.find(_header, _header_ptr)
             if _header_ptr >= 0:
-                if len(data[_header_ptr:]) >= 9:
+                if data_len - _header_ptr >= 9:
                     # smallest processable data:
                     # hdr plus 5 bytes=>at least 9 bytes
-                    msg_length = 256 * data[_header_ptr + 4] + data[_header_ptr + 5]
+                    (msg_length,) = _unpack_uint16(data, _header_ptr + 4)
                     # msg_length comes in bytes 4 and 5
                 else:
-                    msg_length = len(data) + 1
+                    msg_length = data_len + 1
             else:
                 Ism8.log.debug("No ISM8-signature in network message. Skipping data.")
                 break
@@ -159,139 +279,169 @@ class Ism8(asyncio.Protocol):
             # 2 possible outcomes here: Buffer is to short for message=>abort
             # buffer is larger than msg => : process 1 message,
             # then continue loop
-            if len(data) < _header_ptr + msg_length:
+            if data_len < _header_ptr + msg_length:
                 Ism8.log.debug("Buffer shorter than expected / broken Message.")
-                # Ism8.log.debug(f"Discarding: {data[_header_ptr:]}")
+                if Ism8.log.isEnabledFor(logging.DEBUG):
+                    Ism8.log.debug("Discarding: %s", data[_header_ptr:].hex(":"))
                 # setting Ptr to end of data will end loop
-                _header_ptr = len(data)
+                _header_ptr = data_len
             else:
-                # send ACK to ISM8 according to API: ISM Header,
-                # then msg-length(17), then ACK w/ 2 bytes from original msg
-                ack_msg = bytearray(ISM_ACK_DP_MSG)
-                ack_msg[12] = data[_header_ptr + 12]
-                ack_msg[13] = data[_header_ptr + 13]
-                if self._transport:
-                    self._transport.write(ack_msg)  # type: ignore
-                # process message without header (first 10 bytes)
-                self.process_msg(data[_header_ptr + 10 : _header_ptr + msg_length])
-                # prepare to get next message; advance Ptr to next Msg
-                _header_ptr += msg_length
+                try:
+                    # check message without header (first 10 bytes) before
+                    # acknowledging it, decoding follows the ACK
+                    dps = _split_msg(
+                        data_view[_header_ptr + 10 : _header_ptr + msg_length]
+                    )
+                except Ism8ProtocolError as err:
+                    # broken messages are not acknowledged
+                    Ism8.log.error("Discarding broken message: %s", err)
+                else:
+                    # send ACK to ISM8 according to API: ISM Header,
+                    # then msg-length(17), then ACK w/ 2 bytes from original msg
+                    if _writelines:
+                        _writelines(
+                            (
+                                _ack_head,
+                                data_view[_header_ptr + 12 : _header_ptr + 14],
+                                _ack_tail,
+                            )
+                        )
+                    _decode_dps(dps)
+                # prepare to get next message; advance Ptr to next Msg.
+                # a zero length would never leave the current header
+                _header_ptr += msg_length or len(_header)
 
     def process_msg(self, msg):
         """
         Processes received datagram(s) according to ISM8 API specification.
-        Split into dp_id, message length and encoded values for further processing
+        Split into dp_id, message length and encoded values for further processing.
+        Raises Ism8ProtocolError if the datagram is shorter than announced
+        """
+        self._decode_dps(self._split_msg(msg))
+
+    @staticmethod
+    def _split_msg(msg) -> list:
+        """
+        Checks the structure of a received datagram and splits it into
+        (dp_id, raw value) pairs, without decoding anything yet.
+        Raises Ism8ProtocolError if the datagram is shorter than announced
         """
+        _unpack_dp_header = _DP_HEADER.unpack_from
+        # slicing the memoryview hands out the raw values without copying
+        msg_view = memoryview(msg)
+        msg_len = len(msg_view)
+        if msg_len < 6:
+            raise Ism8ProtocolError(f"datagram too short: {msg_len} bytes")
         # number of datapoints in message are coded into bytes 4 and 5
-        max_dp = msg[4] * 256 + msg[5]
+        (max_dp,) = _UINT16.unpack_from(msg, 4)
+        dps = []
         # i keeps track of the bytes
         i = 0
         # loop over datapoint counter, until all dps are processed
         dp_ctr = 1
         while dp_ctr <= max_dp:
-            Ism8.log.debug("DP %d / %d in datagram:", dp_ctr, max_dp)
-            dp_id = msg[i + 6] * 256 + msg[i + 7]
-            dp_length = msg[i + 9]
-            dp_raw_value = bytearray(msg[i + 10 : i + 10 + dp_length])
-            Ism8.log.debug(
-                "Processing DP-ID %d, %s, message: %s",
-                dp_id,
-                DATAPOINTS.get(dp_id, "unknown")[IX_NAME],
-                dp_raw_value.hex(":"),
-            )
-            self.decode_datapoint(dp_id, dp_raw_value)
+            if i + 10 > msg_len:
+                raise Ism8ProtocolError(f"DP {dp_ctr} / {max_dp} missing in datagram")
+            dp_id, _, dp_length = _unpack_dp_header(msg, i + 6)
+            if i + 10 + dp_length > msg_len:
+                raise Ism8ProtocolError(f"DP {dp_id} value exceeds datagram")
+            dps.append((dp_id, msg_view[i + 10 : i + 10 + dp_length]))
             # now advance byte counter and datapoint counter
             dp_ctr += 1
             i = i + 10 + dp_length
-
-    def decode_datapoint(self, dp_id: int, raw_bytes: bytearray) -> None:
+        return dps
+
+    def _decode_dps(self, dps: list) -> None:
+        """decodes the (dp_id, raw value) pairs of a split datagram"""
+        _decode_datapoint = self.decode_datapoint
+        _dp_name = _DP_NAME
+        _dbg = Ism8.log.isEnabledFor(logging.DEBUG)
+        max_dp = len(dps)
+        for dp_ctr, (dp_id, dp_raw_value) in enumerate(dps, 1):
+            if _dbg:
+                Ism8.log.debug("DP %d / %d in datagram:", dp_ctr, max_dp)
+                Ism8.log.debug(
+                    "Processing DP-ID %d, %s, message: %s",
+                    dp_id,
+                    _dp_name.get(dp_id, "unknown"),
+                    dp_raw_value.hex(":"),
+                )
+            _decode_datapoint(dp_id, dp_raw_value)
+
+    def decode_datapoint(self, dp_id: int, raw_bytes: bytes | memoryview) -> None:
         """
         receives raw bytes, decodes them according to ISM8-API data type
         into int/str/float values and stores them in dictionary
         """
-        if dp_id in DATAPOINTS:
-            dp_type = DATAPOINTS[dp_id][IX_TYPE]
-        else:
-            Ism8.log.error(f"unknown datapoint: {dp_id}, data:{raw_bytes}")
+        if dp_id not in _DP_CODEC:
+            Ism8.log.error("unknown datapoint: %s, data:%s", dp_id, raw_bytes.hex(":"))
             return
 
-        result = 0
-        for single_byte in raw_bytes:
-            result = result * 256 + int(single_byte)
-
-        if dp_type in (
-            "DPT_Switch",
-            "DPT_Bool",
-            "DPT_Enable",
-            "DPT_OpenClose",
-        ):
-            self._dp_values[dp_id] = decode_Bool(result)
-
-        elif dp_type in (
-            "DPT_Value_Temp",
-            "DPT_Value_Tempd",
-            "DPT_Tempd",
-            "DPT_Value_Pres",
-            "DPT_Power",
-            "DPT_Value_Volume_Flow",
-        ):
-            temp_value = decode_Float(result)
-            if temp_value is None or (temp_value > 1000 and dp_type == "DPT_Power"):
-                # ignore invalid data, not clear where it comes from...
-                Ism8.log.debug("discarding %s, out of range", temp_value)
+        if self._decode_only_registered:
+            if dp_id not in self._callback_on_data:
+                # defer decoding until the value is read
+                self._dp_raw_pending[dp_id] = int.from_bytes(raw_bytes, byteorder="big")
                 return
-            else:
-                self._dp_values[dp_id] = temp_value
-
-        elif dp_type in ("DPT_ActiveEnergy", "DPT_ActiveEnergy_kWh"):
-            self._dp_values[dp_id] = decode_Int(result)
-
-        elif dp_type == "DPT_FlowRate_m3/h":
-            temp_value = 0.0001 * decode_Int(result)
-            # ignore wrong data , not clear where it comes from...
-            if temp_value > 1000:
-                Ism8.log.debug("discarding %s, out of range", temp_value)
-                return
-            else:
-                self._dp_values[dp_id] = temp_value
-
-        elif dp_type == "DPT_Scaling":
-            self._dp_values[dp_id] = decode_Scaling(result)
-
-        elif dp_type == "DPT_HVACMode":
-            self._dp_values[dp_id] = decode_dict(result, HVACModes)
-
-        elif dp_type == "DPT_HVACMode_CWL":
-            self._dp_values[dp_id] = decode_dict(result, HVACModes_CWL)
-
-        elif dp_type == "DPT_DHWMode":
-            self._dp_values[dp_id] = decode_dict(result, DHWModes)
-
-        elif dp_type == "DPT_HVACContrMode":
-            self._dp_values[dp_id] = decode_dict(result, HVACContrModes)
-
-        elif dp_type == "DPT_Date":
-            self._dp_values[dp_id] = decode_date(result)
-
-        elif dp_type == "DPT_TimeOfDay":
-            self._dp_values[dp_id] = decode_time_of_day(result)
-
-        else:
-            Ism8.log.info(f"datatype <{dp_type}> not implemented, fallback to INT.")
-            self._dp_values[dp_id] = decode_Int(result)
+            self._dp_raw_pending.pop(dp_id, None)
 
-        if self._dp_values[dp_id] is not None:
-            Ism8.log.debug(f"decoded {result} to {self._dp_values[dp_id]}")
+        bytes_decoder = _DP_BYTES_DECODER.get(dp_id)
+        if bytes_decoder is not None:
+            # no detour via int for datatypes decoded from the received bytes
+            stored = self._decode_result(dp_id, raw_bytes, bytes_decoder)
         else:
-            Ism8.log.error(f"decoding of dp {dp_id} data, type {dp_type} failed")
+            result = int.from_bytes(raw_bytes, byteorder="big")
+            stored = self._decode_result(dp_id, result)
+        if not stored:
+            return
 
-        if dp_id in self._callback_on_data.keys():
-            Ism8.log.debug(f"calling callback for dp_id {dp_id}.")
+        if dp_id in self._callback_on_data:
+            Ism8.log.debug("calling callback for dp_id %s.", dp_id)
             self._callback_on_data[dp_id]()
         else:
-            Ism8.log.debug(f"no callback for dp_id {dp_id}.")
+            Ism8.log.debug("no callback for dp_id %s.", dp_id)
         return
 
+    def _decode_result(self, dp_id: int, result, decoder=None) -> bool:
+        """
+        decodes the integer value of a datapoint according to its data type
+        and stores it in dictionary. A decoder given by the caller replaces the
+        one of the data type, e.g. to decode the received bytes instead.
+        Returns False if the value was discarded or could not be decoded
+        """
+        dp_type, dp_decoder, _ = _DP_CODEC[dp_id]
+        if decoder is None:
+            decoder = dp_decoder
+        if decoder is None:
+            Ism8.log.info("datatype <%s> not implemented, fallback to INT.", dp_type)
+            decoder = decode_Int
+        try:
+            value = decoder(result)
+        except (ValueError, struct.error) as err:
+            # e.g. a date with month 0 or too few bytes. the last good value
+            # is kept, a broken reading must not end the connection or abort
+            # reading other sensors
+            Ism8.log.error(
+                "decoding of dp %s data, type %s failed: %s", dp_id, dp_type, err
+            )
+            return False
+
+        if dp_type in _DISCARD_ABOVE:
+            limit = _DISCARD_ABOVE[dp_type]
+            if value is None or (limit is not None and value > limit):
+                # ignore invalid data, not clear where it comes from...
+                Ism8.log.debug("discarding %s, out of range", value)
+                return False
+        self._dp_values[dp_id] = value
+
+        if value is not None:
+            if Ism8.log.isEnabledFor(logging.DEBUG):
+                if not isinstance(result, int):
+                    result = result.hex(":")
+                Ism8.log.debug("decoded %s to %s", result, value)
+        else:
+            Ism8.log.error("decoding of dp %s data, type %s failed", dp_id, dp_type)
+        return True
+
     def send_dp_value(self, dp_id: int, value) -> None:
         """
         sends values for a (writable) datapoint in ISM8. Before message is sent,
@@ -312,86 +462,70 @@ class Ism8(asyncio.Protocol):
         if encoded_value is not None:
             # prepare frame with obj info
             update_msg = self.build_message(dp_id, encoded_value)
-            Ism8.log.debug(f"sending datapoint number {dp_id} as {encoded_value}")
-            Ism8.log.debug(f"update msg = {update_msg}")
+            if Ism8.log.isEnabledFor(logging.DEBUG):
+                Ism8.log.debug(
+                    "sending datapoint number %s as %s", dp_id, encoded_value.hex(":")
+                )
+                Ism8.log.debug("update msg = %s", update_msg.hex(":"))
             # now send message to ISM8
             self._transport.write(update_msg)  # type: ignore
             # after sending update internal cache
-            Ism8.log.debug(f"updating cache for {dp_id} with {value}")
+            Ism8.log.debug("updating cache for %s with %s", dp_id, value)
+            self._dp_raw_pending.pop(dp_id, None)
             self._dp_values[dp_id] = value
         return
 
-    def build_message(self, dp_id: int, encoded_value: bytearray):
-        update_msg = bytearray()
-        update_msg.extend(ISM_HEADER)
-        update_msg.extend((0).to_bytes(2, byteorder="big"))
-        update_msg.extend(ISM_CONN_HEADER)
-        update_msg.extend(ISM_SERVICE_TRANSMIT)
-        update_msg.extend(dp_id.to_bytes(2, byteorder="big"))
-        update_msg.extend((1).to_bytes(2, byteorder="big"))
-
-        update_msg.extend(dp_id.to_bytes(2, byteorder="big"))
-        update_msg.extend((0).to_bytes(1, byteorder="big"))
-        update_msg.extend((len(encoded_value)).to_bytes(1, byteorder="big"))
+    def build_message(self, dp_id: int, encoded_value: bytes):
+        prefix = self._tx_prefix_cache.get(dp_id)
+        if prefix is None:
+            # everything up to the value length only depends on the dp_id:
+            # header, frame size (set below), connection header, service,
+            # start dp, number of dps, dp_id, command
+            prefix = struct.pack(
+                ">4sH4s2sHHHB",
+                ISM_HEADER,
+                0,
+                ISM_CONN_HEADER,
+                ISM_SERVICE_TRANSMIT,
+                dp_id,
+                1,
+                dp_id,
+                0,
+            )
+            self._tx_prefix_cache[dp_id] = prefix
+        update_msg = bytearray(prefix)
+        update_msg.append(len(encoded_value))
         update_msg.extend(encoded_value)
-        frame_size = len(update_msg).to_bytes(2, byteorder="big")
-        update_msg[4] = frame_size[0]
-        update_msg[5] = frame_size[1]
+        # frame size comes in bytes 4 and 5
+        struct.pack_into(">H", update_msg, 4, len(update_msg))
         return update_msg
 
     def encode_datapoint(self, value, dp_id):
         # check if DP exists
-        if dp_id in DATAPOINTS:
-            dp_type = DATAPOINTS[dp_id][IX_TYPE]
-        else:
-            Ism8.log.error(f"unknown datapoint: {dp_id}, data: {value}")
+        codec = _DP_CODEC.get(dp_id)
+        if codec is None:
+            Ism8.log.error("unknown datapoint: %s, data: %s", dp_id, value)
             return
+        dp_type, _, encoder = codec
 
-        if dp_type in (
-            "DPT_Switch",
-            "DPT_Bool",
-            "DPT_Enable",
-            "DPT_OpenClose",
-        ):
-            return encode_Bool(value)
-
-        elif dp_type in (
-            "DPT_Value_Temp",
-            "DPT_Value_Tempd",
-            "DPT_Tempd",
-            "DPT_Value_Pres",
-            "DPT_Power",
-            "DPT_Value_Volume_Flow",
-        ):
-            return encode_Float(value)
-
-        elif dp_type == "DPT_Scaling":
-            return encode_Scaling(value)
-
-        elif dp_type == "DPT_HVACMode":
-            return encode_dict(value, HVACModes)
-
-        elif dp_type == "DPT_HVACMode_CWL":
-            return encode_dict(value, HVACModes_CWL)
-
-        elif dp_type == "DPT_HVACContrMode":
-            return encode_dict(value, HVACContrModes)
-
-        elif dp_type == "DPT_DHWMode":
-            return encode_dict(value, DHWModes)
-
-        elif dp_type == "DPT_Date":
-            return encode_date(value)
-
-        elif dp_type == "DPT_TimeOfDay":
-            return encode_time_of_day(value)
-
-        else:
-            Ism8.log.info(f"writing datatype not implemented: {dp_type}")
+        if encoder is None:
+            Ism8.log.info("writing datatype not implemented: %s", dp_type)
             return None
+        return encoder(value)
 
     def read_sensor(self, dp_id: int):
         """
         Returns sensor value from private dictionary of sensor-readings
         """
+        if dp_id in self._dp_raw_pending:
+            self._decode_result(dp_id, self._dp_raw_pending.pop(dp_id))
         return self._dp_values.get(dp_id, None)
+
+    def read_sensors(self, dp_ids) -> list:
+        """
+        Returns sensor values for several datapoints at once, in order of dp_ids
+        """
+        if self._dp_raw_pending:
+            return [self.read_sensor(dp_id) for dp_id in dp_ids]
+        dp_values = self._dp_values
+        return [dp_values.get(dp_id) for dp_id in dp_ids]
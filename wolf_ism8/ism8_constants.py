@@ -358,6 +358,22 @@ DHWModes = {
     4: "Standby",
 }
 
+# mode dictionaries as tuples indexed by mode number, unused numbers are None
+HVACModes_TABLE = tuple(HVACModes.get(i) for i in range(max(HVACModes) + 1))
+HVACModes_CWL_TABLE = tuple(
+    HVACModes_CWL.get(i) for i in range(max(HVACModes_CWL) + 1)
+)
+DHWModes_TABLE = tuple(DHWModes.get(i) for i in range(max(DHWModes) + 1))
+HVACContrModes_TABLE = tuple(
+    HVACContrModes.get(i) for i in range(max(HVACContrModes) + 1)
+)
+
+# reverse mode dictionaries (mode name -> mode number) for encoding
+HVACModes_REV = {v: k for k, v in HVACModes.items()}
+HVACModes_CWL_REV = {v: k for k, v in HVACModes_CWL.items()}
+DHWModes_REV = {v: k for k, v in DHWModes.items()}
+HVACContrModes_REV = {v: k for k, v in HVACContrModes.items()}
+
 DP_VALUES_ALLOWED = {
     56: tuple(range(20, 81, 1)),
     57: tuple(HVACModes.values()),
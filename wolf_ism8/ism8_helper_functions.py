@@ -1,41 +1,102 @@
 import logging
 import datetime
+import struct
 from .ism8_constants import *
 
 log = logging.getLogger(__name__)
 
+# precompiled struct layouts for the encoders and the byte-based decoders
+_PACK_B = struct.Struct(">B").pack
+_PACK_BB = struct.Struct(">BB").pack
+_PACK_BBB = struct.Struct(">BBB").pack
+_UNPACK_BBB = struct.Struct(">BBB").unpack_from
+
+# shared encodings of boolean datapoints
+_TRUE = b"\x01"
+_FALSE = b"\x00"
+
+# allowed values for writing, precomputed per datapoint: a set for datapoints
+# taking strings, the (min, max) range for all others
+_DP_ALLOWED_SET = {}
+_DP_RANGE = {}
+for _dp_id, _values in DP_VALUES_ALLOWED.items():
+    if isinstance(_values[0], str):
+        _DP_ALLOWED_SET[_dp_id] = frozenset(_values)
+    else:
+        _DP_RANGE[_dp_id] = (min(_values), max(_values))
+del _dp_id, _values
+
+# writable datapoints and the python type expected for writing them
+_DP_WRITABLE = frozenset(
+    _dp_id for _dp_id, _dp in DATAPOINTS.items() if _dp[IX_RW_FLAG]
+)
+_DP_PYTYPE = {
+    _dp_id: DATATYPES[DATAPOINTS[_dp_id][IX_TYPE]][DT_PYTHONTYPE]
+    for _dp_id in _DP_WRITABLE
+}
+
+# the library's mode dictionaries and their reverse dictionaries
+# (mode name -> mode number), which encode_dict uses instead of a search
+_MODE_REVERSE = (
+    (HVACModes, HVACModes_REV),
+    (HVACModes_CWL, HVACModes_CWL_REV),
+    (DHWModes, DHWModes_REV),
+    (HVACContrModes, HVACContrModes_REV),
+)
+
 
 def decode_dict(mode_number: int, mode_dic: dict) -> str | None:
     """returns a human readable string from the API-encoded mode_number"""
-    if mode_number in mode_dic.keys():
-        return mode_dic[mode_number]
+    mode = mode_dic.get(mode_number)
+    if mode is None:
+        log.error("mode number %s not implemented", mode_number)
+    return mode
+
+
+def decode_table(mode_number: int, mode_table: tuple) -> str | None:
+    """returns a human readable string from the API-encoded mode_number,
+    using one of the mode tables indexed by mode number"""
+    if mode_number < len(mode_table) and mode_table[mode_number] is not None:
+        return mode_table[mode_number]
     else:
-        log.error(f"mode number {mode_number} not implemented:")
+        log.error("mode number %s not implemented", mode_number)
         return None
 
 
-def encode_dict(mode: str, mode_dic: dict) -> bytearray | None:
+def encode_dict(mode: str, mode_dic: dict) -> bytes | None:
     """encodes a string into corresponding ISM-Mode numbers"""
-    entry_list = [item[0] for item in mode_dic.items() if item[1] == mode]
+    for known_dic, known_rev in _MODE_REVERSE:
+        if mode_dic is known_dic:
+            return encode_reverse(mode, known_rev)
+    entry_list = [k for k, v in mode_dic.items() if v == mode]
     if not entry_list:
-        log.error(f"error encoding {mode}")
-        log.error(f"available modes: {mode_dic.items()}")
+        log.error("error encoding %s", mode)
+        log.error("available modes: %s", list(mode_dic.values()))
         return None
-    if len(entry_list) == 1:
-        # the bytearray-constructor NEEDS a list with one entry!
-        # do not cast the mode-number on its own
-        return bytearray(entry_list)
-    else:
-        log.error(f"error encoding mode {mode}, matching not exact ")
+    if len(entry_list) > 1:
+        log.error("error encoding mode %s, matching not exact", mode)
+        return None
+    return bytes(entry_list)
+
+
+def encode_reverse(mode: str, mode_rev: dict) -> bytes | None:
+    """encodes a string into corresponding ISM-Mode number,
+    using one of the reverse mode dictionaries (mode name -> mode number)"""
+    mode_number = mode_rev.get(mode)
+    if mode_number is None:
+        log.error("error encoding %s", mode)
+        log.error("available modes: %s", list(mode_rev))
         return None
+    return bytes((mode_number,))
 
 
 def decode_Scaling(input: int) -> float:
     return 100 / 255 * input
 
 
-def encode_Scaling(input: float) -> bytearray:
-    return bytearray([round(input / (100 / 255))])
+def encode_Scaling(input: float) -> bytes:
+    # clamp into 0..255 instead of raising on slightly out-of-range input
+    return _PACK_B(min(255, max(0, round(input / (100 / 255)))))
 
 
 def decode_Bool(input: int) -> bool:
@@ -43,8 +104,8 @@ def decode_Bool(input: int) -> bool:
     return bool(input & 0b1)
 
 
-def encode_Bool(input: int) -> bytearray:
-    return bytearray(b"\x01") if bool(input) is True else bytearray(b"\x00")
+def encode_Bool(input: int) -> bytes:
+    return _TRUE if input else _FALSE
 
 
 def decode_Int(input: int) -> int:
@@ -61,29 +122,33 @@ def decode_Float(input: int) -> float | None:
         return None
     if _sign == 1:
         _mantisse = -(~(_mantisse - 1) & 0x07FF)
-    decoded_float = float(0.01 * (2**_exponent) * _mantisse)
+    decoded_float = 0.01 * (1 << _exponent) * _mantisse
     return decoded_float
 
 
-def encode_Float(input: float) -> bytearray:
-    input = round(input, 2)
-    data = [0, 0]
-    encoded_float = bytearray()
-    _exponent = 0
-    _mantisse_calc = round(abs(input) * 100)
-    while _mantisse_calc.bit_length() > 11:
+def encode_Float(input: float) -> bytes:
+    _scaled = input * 100
+    # smallest exponent for which the rounded mantisse fits into 11 bits.
+    # a positive mantisse with all bits set marks invalid data, so it is
+    # skipped unless the exponent is already at its 4 bit maximum.
+    # everything is derived from the unrounded _scaled, so the limit check
+    # and the final mantisse see the same rounding
+    _mantisse_limit = 0x7FF if _scaled >= 0 else 0x800
+    _exponent = max(0, round(abs(_scaled)).bit_length() - 11)
+    if _exponent < 15 and round(abs(_scaled) / (1 << _exponent)) >= _mantisse_limit:
         _exponent += 1
-        _mantisse_calc = round(_mantisse_calc / 2)
-    _mantisse = round(input * 100 / (1 << _exponent))
-    if input < 0:
-        data[0] |= 0x80
-        _mantisse = round((~(_mantisse * -1) + 1) & 0x07FF)
-    data[0] |= (_exponent & 0x0F) << 3
-    data[0] |= (_mantisse >> 8) & 0x7
-    data[1] |= _mantisse & 0xFF
-    for byte in data:
-        encoded_float.append(byte)
-    # log.debug(f"encoded {input} -> {encoded_float.hex(':')}")
+    _mantisse = round(_scaled / (1 << _exponent))
+    _sign = 0
+    if _mantisse < 0:
+        _sign = 0x80
+        # _mantisse is negative here, masking yields its 11 bit two's complement
+        _mantisse &= 0x07FF
+    encoded_float = _PACK_BB(
+        _sign | ((_exponent & 0x0F) << 3) | ((_mantisse >> 8) & 0x7),
+        _mantisse & 0xFF,
+    )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("encoded %s -> %s", input, encoded_float.hex(":"))
     return encoded_float
 
 
@@ -94,12 +159,16 @@ def decode_date(input: int) -> datetime.date:
     return datetime.date(year + 2000, month, day)
 
 
-def encode_date(input: datetime.date) -> bytearray:
-    encoded_date = bytearray()
-    encoded_date.append(input.day)
-    encoded_date.append(input.month)
-    encoded_date.append(input.year - 2000)
-    log.debug(f"encoded {input} -> {encoded_date.hex(':')}")
+def decode_date_bytes(input: bytes, offset: int = 0) -> datetime.date:
+    """decodes a date directly from the 3 bytes (day, month, year) on the wire"""
+    day, month, year = _UNPACK_BBB(input, offset)
+    return datetime.date((year & 0x7F) + 2000, month & 0x0F, day & 0x1F)
+
+
+def encode_date(input: datetime.date) -> bytes:
+    encoded_date = _PACK_BBB(input.day, input.month, input.year - 2000)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("encoded %s -> %s", input, encoded_date.hex(":"))
     return encoded_date
 
 
@@ -110,12 +179,19 @@ def decode_time_of_day(input: int) -> datetime.time:
     return datetime.time(hour=hours, minute=minutes, second=seconds)
 
 
-def encode_time_of_day(input: datetime.time) -> bytearray:
-    encoded_time = bytearray()
-    encoded_time.append(input.hour)
-    encoded_time.append(input.minute)
-    encoded_time.append(input.second)
-    log.debug(f"encoded {input} -> {encoded_time.hex(':')}")
+def decode_time_of_day_bytes(input: bytes, offset: int = 0) -> datetime.time:
+    """decodes a time directly from the 3 bytes (hours, minutes, seconds) on
+    the wire"""
+    hours, minutes, seconds = _UNPACK_BBB(input, offset)
+    return datetime.time(
+        hour=hours & 0x1F, minute=minutes & 0x3F, second=seconds & 0x3F
+    )
+
+
+def encode_time_of_day(input: datetime.time) -> bytes:
+    encoded_time = _PACK_BBB(input.hour, input.minute, input.second)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("encoded %s -> %s", input, encoded_time.hex(":"))
     return encoded_time
 
 
@@ -124,26 +200,24 @@ def validate_dp_range(dp_id: int, value) -> bool:
     checks if value is valid for the datapoint before sending to ISM
     """
     # check if dp is R/O
-    if not DATAPOINTS[dp_id][IX_RW_FLAG]:
-        log.error(f"datapoint {dp_id} is not writable")
+    if dp_id not in _DP_WRITABLE:
+        log.error("datapoint %s is not writable", dp_id)
         return False
 
     # check if datatype is as expected
-    dp_type = DATAPOINTS[dp_id][IX_TYPE]
-    python_datatype = DATATYPES[dp_type][DT_PYTHONTYPE]
+    python_datatype = _DP_PYTYPE[dp_id]
     if not isinstance(value, python_datatype):
-        log.error(f"DP {dp_id} should be {python_datatype}, but is {type(value)}")
+        log.error("DP %s should be %s, but is %s", dp_id, python_datatype, type(value))
         return False
 
     # check if value is in allowed range
     if isinstance(value, str):
-        if value not in DP_VALUES_ALLOWED[dp_id]:
-            log.error(f"value {value} is out of range")
+        if value not in _DP_ALLOWED_SET[dp_id]:
+            log.error("value %s is out of range", value)
             return False
     else:
-        if (value > max(DP_VALUES_ALLOWED[dp_id])) or (
-            value < min(DP_VALUES_ALLOWED[dp_id])
-        ):
-            log.error(f"value {value} is out of range")
+        value_min, value_max = _DP_RANGE[dp_id]
+        if (value > value_max) or (value < value_min):
+            log.error("value %s is out of range", value)
             return False
     return True